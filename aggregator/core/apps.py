@@ -1,5 +1,6 @@
 import importlib
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Type
 
 from aggregator.core import signals
@@ -7,6 +8,14 @@ from aggregator.core.exceptions import PluginLoadError
 from aggregator.settings import settings
 
 
+@lru_cache(maxsize=None)
+def _import_class(dotted_path: str):
+    """Resolve 'pkg.module.Class' once; repeat lookups skip the import walk."""
+    module_path, class_name = dotted_path.rsplit(".", 1)
+    module = importlib.import_module(module_path)
+    return getattr(module, class_name)
+
+
 class PluginService(ABC):
     """Contract every plugin service must implement."""
 
@@ -50,9 +59,7 @@ class AppConfig:
         if not self.service_class_path:
             raise PluginLoadError(f"No service_class_path set for {self.name}")
 
-        module_path, class_name = self.service_class_path.rsplit(".", 1)
-        module = importlib.import_module(module_path)
-        service_cls: Type[PluginService] = getattr(module, class_name)
+        service_cls: Type[PluginService] = _import_class(self.service_class_path)
         service = service_cls(self.settings)
         return service
 
@@ -81,9 +88,7 @@ class AppRegistry:
             signals.app_ready.send(sender=config, service=service)
 
     def _load_app_config(self, dotted_path: str) -> AppConfig:
-        module_path, class_name = dotted_path.rsplit(".", 1)
-        module = importlib.import_module(module_path)
-        config_cls: Type[AppConfig] = getattr(module, class_name)
+        config_cls: Type[AppConfig] = _import_class(dotted_path)
         return config_cls(self.settings)
 
     def _validate_dependencies(self) -> None:
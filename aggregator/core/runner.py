@@ -1,5 +1,7 @@
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Iterable
 
 from aggregator.core import signals
@@ -8,12 +10,19 @@ from aggregator.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Plugins are network-bound and independent; a small pool overlaps their I/O
+# waits without hammering the upstream APIs or the database.
+MAX_CONCURRENT_PLUGINS = 4
+
 
 class AggregationRunner:
     """Coordinates plugin lifecycle and execution."""
 
     def __init__(self, services: Iterable[PluginService]) -> None:
         self.services = list(services)
+        # Writes all land on the same MySQL instance; serialize that phase so
+        # concurrent fetches never contend on the connection.
+        self._write_lock = threading.Lock()
 
     def sync(self) -> None:
         """Prepare persistence for all plugins."""
@@ -25,45 +34,73 @@ class AggregationRunner:
                 logger.exception("Failed to set up %s", service.name)
 
     def run_once(self) -> None:
-        for service in self.services:
-            logger.info("Processing %s", service.name)
-            try:
-                logger.info("Setting up %s persistence", service.name)
-                service.setup()
+        if not self.services:
+            return
+        max_workers = min(len(self.services), MAX_CONCURRENT_PLUGINS)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self._process_service, service): service
+                for service in self.services
+            }
+            for future in as_completed(futures):
+                service = futures[future]
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception("Error while processing %s", service.name)
 
-                logger.info("Fetching %s data", service.name)
-                data = service.fetch_data()
-                signals.data_fetched.send(sender=service, data=data)
+    def _process_service(self, service: PluginService) -> None:
+        logger.info("Processing %s", service.name)
 
-                record_count = 0
-                if isinstance(data, dict):
-                    record_count = sum(len(df) for df in data.values() if df is not None)
-                elif hasattr(data, "__len__"):
-                    record_count = len(data)  # type: ignore[arg-type]
-                logger.info("%s data fetched (%s records)", service.name, record_count)
+        logger.info("Setting up %s persistence", service.name)
+        service.setup()
 
-                if data is None:
-                    logger.info("No data returned for %s", service.name)
-                    continue
+        logger.info("Fetching %s data", service.name)
+        data = service.fetch_data()
+        signals.data_fetched.send(sender=service, data=data)
 
-                logger.info("Writing %s data to storage", service.name)
-                inserted, duplicates = service.write_data(data)
-                signals.data_written.send(
-                    sender=service,
-                    inserted=inserted,
-                    duplicates=duplicates,
-                )
-                logger.info(
-                    "%s write complete (inserted=%s duplicates=%s)",
-                    service.name,
-                    inserted,
-                    duplicates,
-                )
-            except Exception:
-                logger.exception("Error while processing %s", service.name)
+        record_count = 0
+        if isinstance(data, dict):
+            record_count = sum(len(df) for df in data.values() if df is not None)
+        elif isinstance(data, (list, tuple)):
+            record_count = sum(len(df) for df in data if df is not None)
+        elif hasattr(data, "__len__"):
+            record_count = len(data)  # type: ignore[arg-type]
+        logger.info("%s data fetched (%s records)", service.name, record_count)
+
+        if data is None:
+            logger.info("No data returned for %s", service.name)
+            return
+
+        logger.info("Writing %s data to storage", service.name)
+        with self._write_lock:
+            inserted, duplicates = service.write_data(data)
+        signals.data_written.send(
+            sender=service,
+            inserted=inserted,
+            duplicates=duplicates,
+        )
+        logger.info(
+            "%s write complete (inserted=%s duplicates=%s)",
+            service.name,
+            inserted,
+            duplicates,
+        )
 
     def run_forever(self) -> None:
+        # Fixed-cadence schedule: sleep only the residual until the next
+        # deadline so cycle cost doesn't push every later fetch back.
+        interval = settings.interval_seconds
+        next_tick = time.monotonic()
         while True:
+            next_tick += interval
             self.run_once()
-            logger.info("Sleeping for %s seconds", settings.interval_seconds)
-            time.sleep(settings.interval_seconds)
+            remaining = next_tick - time.monotonic()
+            if remaining > 0:
+                logger.info("Sleeping for %.1f seconds", remaining)
+                time.sleep(remaining)
+            else:
+                logger.warning(
+                    "Cycle overran the %ss interval by %.1fs", interval, -remaining
+                )
+                next_tick = time.monotonic()
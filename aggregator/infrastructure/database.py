@@ -1,10 +1,15 @@
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, List
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
+try:  # Optional: statement-aware SQL splitting.
+    import sqlparse
+except ImportError:  # pragma: no cover
+    sqlparse = None
+
 from aggregator.settings import settings
 
 _engine: Engine | None = None
@@ -16,7 +21,11 @@ def get_engine() -> Engine:
     if _engine is None:
         db = settings.database
         _engine = create_engine(
-            f"mysql+mysqlconnector://{db.user}:{db.password}@{db.host}/{db.name}"
+            f"mysql+mysqlconnector://{db.user}:{db.password}@{db.host}/{db.name}",
+            # Wire compression pays off on wide DECIMAL/TEXT rows; local
+            # infile unlocks the LOAD DATA fast path where the server
+            # permits it.
+            connect_args={"compress": True, "allow_local_infile": True},
         )
     return _engine
 
@@ -32,6 +41,20 @@ def connection() -> Iterator:
         conn.close()
 
 
+def split_sql_statements(sql: str) -> List[str]:
+    """Split a SQL script into individual statements.
+
+    Prefers sqlparse, which understands semicolons inside string literals,
+    comments, and procedure bodies; falls back to a plain split for the
+    simple DDL shipped with the plugins.
+    """
+    if sqlparse is not None:
+        statements = (s.strip().rstrip(";") for s in sqlparse.split(sql))
+    else:
+        statements = (s.strip() for s in sql.split(";"))
+    return [s for s in statements if s]
+
+
 def execute_sql_file(filepath: str) -> None:
     """Execute a SQL file against the configured database."""
     path = Path(filepath)
@@ -39,9 +62,5 @@ def execute_sql_file(filepath: str) -> None:
         raise FileNotFoundError(f"SQL file not found: {filepath}")
 
     with connection() as conn:
-        sql_commands = path.read_text().split(";")
-        for command in sql_commands:
-            cleaned = command.strip()
-            if not cleaned:
-                continue
-            conn.execute(text(cleaned))
+        for command in split_sql_statements(path.read_text()):
+            conn.execute(text(command))
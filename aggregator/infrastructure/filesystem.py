@@ -1,7 +1,7 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class PluginState:
@@ -34,3 +34,37 @@ class PluginState:
 
     def get_data_fetch_range_days(self) -> int:
         return 90 if self.is_full_load_completed() else 1825
+
+    def get_last_sync_at(self) -> Optional[datetime]:
+        raw = self.state.get("last_sync_at")
+        if not raw:
+            return None
+        try:
+            return datetime.fromisoformat(raw)
+        except ValueError:
+            return None
+
+    def mark_sync_completed(self) -> None:
+        self.state["last_sync_at"] = datetime.utcnow().isoformat()
+        self._save()
+
+    # -- page cache -------------------------------------------------------
+    # Plugins that paginate over immutable historical windows can park raw
+    # page payloads here and skip the HTTP round trip on the next cycle.
+
+    def _page_cache_dir(self) -> Path:
+        return self.path.parent / f"{self.plugin_name}_pages"
+
+    def load_cached_page(self, key: str) -> Any:
+        path = self._page_cache_dir() / f"{key}.json"
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text())
+        except json.JSONDecodeError:
+            return None
+
+    def save_cached_page(self, key: str, payload: Any) -> None:
+        directory = self._page_cache_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{key}.json").write_text(json.dumps(payload))
@@ -0,0 +1,22 @@
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# One pooled keep-alive session for the whole process. The aggregator talks
+# to a handful of hosts every cycle; sharing the session reuses TLS state and
+# socket buffers across plugins instead of reopening connections per call.
+# Retries are GET-only so plugin POSTs are never replayed.
+SHARED_SESSION = requests.Session()
+SHARED_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+        ),
+    ),
+)
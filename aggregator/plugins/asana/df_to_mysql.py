@@ -1,7 +1,10 @@
 import os
+import tempfile
 
 import mysql.connector
+import pandas as pd
 from sqlalchemy import create_engine, text
+from aggregator.infrastructure.database import split_sql_statements
 from sqlalchemy.types import BOOLEAN, DATETIME, REAL, TEXT, VARCHAR
 
 MYSQL_HOST = os.environ.get("MYSQL_HOST")
@@ -10,21 +13,38 @@ MYSQL_USER = os.environ.get("MYSQL_USER")
 MYSQL_PASSWORD = os.environ.get("MYSQL_PASSWORD")
 
 
+_engine = None
+
+
+def _get_engine():
+    """Lazily create one shared engine; a new pool per call costs a full
+    TCP+TLS+auth handshake and loses connection pooling entirely."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            f"mysql+mysqlconnector://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}",
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_size=4,
+            # Wire compression pays off on wide DECIMAL/TEXT rows; local
+            # infile unlocks the LOAD DATA fast path where the server
+            # permits it.
+            connect_args={"compress": True, "allow_local_infile": True},
+        )
+    return _engine
+
+
 def execute_sql_file(filepath):
     """Executes SQL commands from a file."""
     try:
-        engine = create_engine(
-            f"mysql+mysqlconnector://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
-        )
+        engine = _get_engine()
         connection = engine.connect()
 
         with open(filepath) as sql_file:
-            sql_commands = sql_file.read().split(";")  # Split by semicolon
+            sql_commands = split_sql_statements(sql_file.read())
 
         for command in sql_commands:
-            command = command.strip()
-            if command:  # Ignore empty commands
-                connection.execute(text(command))  # wrap command in text()
+            connection.execute(text(command))
 
         connection.commit()
         print(f"✅ SQL commands from {filepath} executed successfully.")
@@ -38,12 +58,83 @@ def execute_sql_file(filepath):
             connection.close()
 
 
+def _csv_ready(df):
+    """Return a copy whose CSV form LOAD DATA reads back unmangled.
+
+    to_csv renders bools as "True"/"False", both of which MySQL BOOLEAN
+    columns silently coerce to 0 — cast them to 1/0 first (nullable Int64
+    keeps missing values on the na_rep path). Backslashes in text also
+    need doubling: pandas does not backslash-escape, so the statement's
+    default ESCAPED BY '\\' would swallow them on the way in.
+    """
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_bool_dtype(df[column]):
+            df[column] = df[column].astype("Int64")
+        elif df[column].dtype == object or pd.api.types.is_string_dtype(df[column]):
+            df[column] = df[column].map(
+                lambda value: value.replace("\\", "\\\\")
+                if isinstance(value, str)
+                else value
+            )
+    return df
+
+
+def _load_data_infile_ignore(df, table_name, connection):
+    """Bulk-load df via LOAD DATA LOCAL INFILE ... IGNORE.
+
+    One sequential import with no per-row statement parsing; IGNORE skips
+    primary-key collisions server-side, matching the INSERT IGNORE
+    semantics.
+    """
+    df = _csv_ready(df)
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", delete=False, newline=""
+    ) as handle:
+        df.to_csv(handle, index=False, header=False, na_rep="\\N")
+        csv_path = handle.name
+    try:
+        columns = ", ".join(df.columns)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE '{csv_path}' IGNORE INTO TABLE {table_name} "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                f"LINES TERMINATED BY '\\n' ({columns})"
+            )
+            return cursor.rowcount
+        finally:
+            cursor.close()
+    finally:
+        os.unlink(csv_path)
+
+
+def _insert_ignore(table, conn, keys, data_iter):
+    """to_sql method: INSERT IGNORE straight into the destination table.
+
+    Feeds the tuples pandas hands us straight to the raw cursor's
+    executemany — no per-row dict allocation, no statement compilation.
+    """
+    rows = list(data_iter)
+    if not rows:
+        return 0
+    columns = ", ".join(keys)
+    placeholders = ", ".join(["%s"] * len(keys))
+    cursor = conn.connection.cursor()
+    try:
+        cursor.executemany(
+            f"INSERT IGNORE INTO {table.name} ({columns}) VALUES ({placeholders})",
+            rows,
+        )
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
 def write_asana_dataframe_to_mysql_batch(df):
     """Writes an Asana DataFrame to a MySQL database in batches, avoiding duplicates based on task_id. Returns insert and duplicate counts."""
     try:
-        engine = create_engine(
-            f"mysql+mysqlconnector://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
-        )
+        engine = _get_engine()
         connection = engine.connect()
 
         dtype_mapping = {
@@ -66,38 +157,52 @@ def write_asana_dataframe_to_mysql_batch(df):
             "type": VARCHAR(10),
         }
 
-        temp_table_name = "temp_asana_tasks"
-
-        # Remove duplicates in the DataFrame based on task_id (MySQL PK constraint)
+        # No client-side dedupe: the task_id primary key already rejects
+        # duplicates under INSERT IGNORE (intra-batch ones included), so a
+        # pandas drop_duplicates pass here would just redo MySQL's work.
+        # The dropped-row count falls out of the server's reply instead.
         original_count = len(df)
-        df = df.drop_duplicates(subset=["task_id"], keep="first")
-        duplicate_count = original_count - len(df)
-
-        df.to_sql(
-            temp_table_name,
-            con=connection,
-            if_exists="replace",
-            index=False,
-            dtype=dtype_mapping,
-        )
 
-        insert_query = f"""
-            INSERT IGNORE INTO asana_items (
-                task_id, task_name, time_to_completion, project, workspace_id, workspace_name, project_created_at, project_notes,
-                project_owner, completed_by_name, completed_by_email, completed, task_description,
-                date, created_by_name, created_by_email, type
+        if df.empty:
+            print("⚠️ No Asana rows to write.")
+            return 0, 0
+
+        if len(df) == 1:
+            # One row: a direct parameterized INSERT IGNORE beats staging a
+            # CSV or building a bulk statement.
+            row = {k: (None if pd.isna(v) else v) for k, v in df.iloc[0].items()}
+            columns = ", ".join(df.columns)
+            placeholders = ", ".join(f":{col}" for col in df.columns)
+            result = connection.execute(
+                text(f"INSERT IGNORE INTO asana_items ({columns}) VALUES ({placeholders})"),
+                row,
+            )
+            connection.commit()
+            return result.rowcount, 1 - result.rowcount
+
+        # Pipe rows straight into the destination table: LOAD DATA with
+        # IGNORE drops primary-key collisions server-side in one sequential
+        # bulk import. Servers without local_infile fall back to the
+        # INSERT IGNORE writer.
+        try:
+            inserted_count = _load_data_infile_ignore(df, "asana_items", connection)
+        except Exception as exc:
+            print(f"⚠️ LOAD DATA LOCAL INFILE unavailable ({exc}); falling back to INSERT IGNORE.")
+            connection.rollback()
+            inserted_count = (
+                df.to_sql(
+                    "asana_items",
+                    con=connection,
+                    if_exists="append",
+                    index=False,
+                    dtype=dtype_mapping,
+                    method=_insert_ignore,
+                    chunksize=max(1, 65000 // max(1, len(df.columns))),
+                )
+                or 0
             )
-            SELECT 
-                task_id, task_name, time_to_completion, project, workspace_id, workspace_name, project_created_at, project_notes,
-                project_owner, completed_by_name, completed_by_email, completed, task_description,
-                date, created_by_name, created_by_email, type
-            FROM {temp_table_name}
-        """
-        result = connection.execute(text(insert_query))
-        inserted_count = result.rowcount
-
-        connection.execute(text(f"DROP TABLE {temp_table_name}"))
         connection.commit()
+        duplicate_count = max(0, original_count - inserted_count)
         print("✅ Asana DataFrame written to MySQL successfully.")
         return inserted_count, duplicate_count
 
@@ -6,6 +6,8 @@ from datetime import datetime
 import pandas as pd
 import requests
 
+from aggregator.infrastructure.http import SHARED_SESSION
+
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
@@ -21,7 +23,7 @@ def get_workspace_info(access_token, workspace_gid):
     url = f"https://app.asana.com/api/1.0/workspaces/{workspace_gid}"
     headers = {"Authorization": f"Bearer {access_token}"}
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = SHARED_SESSION.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         return response.json()["data"]
     except requests.exceptions.RequestException as e:
@@ -35,7 +37,7 @@ def get_projects(access_token, workspace_gid):
     headers = {"Authorization": f"Bearer {access_token}"}
     params = {"opt_fields": "name, created_at, modified_at, notes, owner.name"}
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = SHARED_SESSION.get(url, headers=headers, params=params, timeout=30)
         response.raise_for_status()
         projects = response.json()["data"]
         logger.info("Asana: found %s projects in workspace %s", len(projects), workspace_gid)
@@ -65,7 +67,7 @@ def get_completed_tasks(access_token, project_gid, days_to_fetch=548):
         while True:
             if next_page:
                 params["offset"] = next_page
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = SHARED_SESSION.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()["data"]
             for task in data:
@@ -97,7 +99,7 @@ def get_completed_subtasks(access_token, task_gid):
         while True:
             if next_page:
                 params["offset"] = next_page
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = SHARED_SESSION.get(url, headers=headers, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()["data"]
             for task in data:
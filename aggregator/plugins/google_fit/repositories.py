@@ -1,4 +1,5 @@
 import logging
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Tuple
 
@@ -17,7 +18,8 @@ class GoogleFitRepository:
         for sql_file in ["steps.sql", "heart.sql", "general.sql"]:
             execute_sql_file(str(base / sql_file))
 
-    def write_dataframe(self, df: pd.DataFrame, table_name: str) -> Tuple[int, int]:
+    def write_dataframe(self, df: pd.DataFrame, table_name: str, conn=None) -> Tuple[int, int]:
+        """Write one metric frame; pass conn to join a caller-managed transaction."""
         if df is None or df.empty:
             return 0, 0
 
@@ -55,13 +57,19 @@ class GoogleFitRepository:
         df = df.drop_duplicates(subset=df.columns.difference(["id"]).tolist(), keep="last")
         duplicate_count = original_count - len(df)
 
-        with connection() as conn:
+        # When the caller supplies a connection the write joins its
+        # transaction; otherwise open (and commit) a dedicated one.
+        with (nullcontext(conn) if conn is not None else connection()) as conn:
+            # method="multi" emits multi-row INSERT ... VALUES (...), (...)
+            # statements, turning one round trip per row into one per chunk.
             df.to_sql(
                 temp_table_name,
                 con=conn,
                 if_exists="replace",
                 index=False,
                 dtype=dtype_mapping[table_name],
+                method="multi",
+                chunksize=1000,
             )
 
             columns = ", ".join(df.columns)
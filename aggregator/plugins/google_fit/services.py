@@ -1,17 +1,26 @@
 import json
 import logging
+import os
+import threading
 import time
 import urllib.parse
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
-import requests
+
+try:  # Optional: faster JSON parsing for large aggregate payloads.
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 from aggregator.core.apps import PluginService
+from aggregator.infrastructure.database import connection
 from aggregator.infrastructure.filesystem import PluginState
+from aggregator.infrastructure.http import SHARED_SESSION
 from aggregator.settings import settings
 
 from .repositories import GoogleFitRepository
@@ -39,14 +48,36 @@ DATA_SOURCES = {
 
 CHUNK_DAYS = 90
 
+AGGREGATE_URL = "https://www.googleapis.com/fitness/v1/users/me/dataset:aggregate"
+
+# Bounded fan-out for the aggregate endpoint; keeps concurrent requests
+# inside the per-user API quota while overlapping the HTTPS round trips.
+MAX_CONCURRENT_REQUESTS = 8
+
+# Narrow dtypes for the aggregated metric columns: daily step counts fit
+# comfortably in 32 bits and the rounded readings in float32, halving what
+# the DB adapter has to serialize. Nullable Int32 preserves missing values.
+METRIC_DTYPES = {
+    "steps": "Int32",
+    "heart_rate": "float32",
+    "value": "float32",
+}
+
 
 class GoogleFitService(PluginService):
     name = "google_fit"
 
-    def __init__(self, project_settings=None) -> None:
+    def __init__(self, project_settings=None, session=None) -> None:
         self.settings = project_settings or settings
         self.state = PluginState(self.name)
         self.repository = GoogleFitRepository()
+        # Shared pooled session: keep-alive reuses the TCP+TLS connection
+        # across the fanned-out aggregate requests instead of paying a
+        # handshake per call.
+        self._session = session or SHARED_SESSION
+        self._credentials = None
+        self._reauth_lock = threading.Lock()
+        self._last_saved_tokens = None
 
     def setup(self) -> bool:
         self.repository.ensure_schema()
@@ -58,10 +89,13 @@ class GoogleFitService(PluginService):
             logger.error("google_fit write_data called with non-dict payload")
             return total_inserted, total_duplicates
 
-        for table, df in payload.items():
-            ins, dup = self.repository.write_dataframe(df, table)
-            total_inserted += ins
-            total_duplicates += dup
+        # One connection and one commit for every table amortizes the
+        # connection checkout and fsync instead of paying them per table.
+        with connection() as conn:
+            for table, df in payload.items():
+                ins, dup = self.repository.write_dataframe(df, table, conn=conn)
+                total_inserted += ins
+                total_duplicates += dup
         return total_inserted, total_duplicates
 
     def fetch_data(self) -> dict:
@@ -73,6 +107,7 @@ class GoogleFitService(PluginService):
             return {}
 
         try:
+            self._credentials = (client_id, client_secret)
             tokens = self._get_tokens(client_id, client_secret)
             if not tokens:
                 return {}
@@ -82,22 +117,50 @@ class GoogleFitService(PluginService):
             headers = {"Authorization": f"Bearer {access_token}"}
             user_info_url = "https://www.googleapis.com/fitness/v1/users/me"
             try:
-                user_response = requests.get(user_info_url, headers=headers)
+                user_response = self._session.get(user_info_url, headers=headers)
                 user_response.raise_for_status()
                 user_id = user_response.json().get("id", "unknown_user")
             except Exception:
                 user_id = "unknown_user"
 
-            steps_df = self._fetch_steps_data(access_token, user_id)
-            hr_df = self._fetch_heart_rate_data(access_token, user_id)
-            general_df = self._fetch_general_data(access_token, user_id)
+            # One shared window list: every metric covers the same span, so
+            # computing it per fetch would redo the arithmetic and let
+            # metrics drift onto different chunk boundaries mid-run.
+            days_to_fetch = self.state.get_data_fetch_range_days()
+            end_dt = datetime.now(timezone.utc)
+            start_dt = end_dt - timedelta(days=days_to_fetch)
+
+            # Steady state: only pull the delta since the last successful
+            # sync, with a one-day overlap so late-arriving points around
+            # the boundary are still caught — the upsert writers absorb the
+            # overlap. The first run still covers the full range.
+            last_sync = self.state.get_last_sync_at()
+            if last_sync is not None:
+                start_dt = max(
+                    start_dt,
+                    last_sync.replace(tzinfo=timezone.utc) - timedelta(days=1),
+                )
+
+            ranges = self._chunked_time_ranges(start_dt, end_dt)
+
+            # The three metric exports are independent; running them
+            # concurrently makes fetch latency max() instead of sum().
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                steps_future = pool.submit(self._fetch_steps_data, access_token, user_id, ranges)
+                hr_future = pool.submit(self._fetch_heart_rate_data, access_token, user_id, ranges)
+                general_future = pool.submit(self._fetch_general_data, access_token, user_id, ranges)
+                steps_df = steps_future.result()
+                hr_df = hr_future.result()
+                general_df = general_future.result()
 
             if (
                 (steps_df is not None and not steps_df.empty)
                 or (hr_df is not None and not hr_df.empty)
                 or (general_df is not None and not general_df.empty)
-            ) and not self.state.is_full_load_completed():
-                self.state.mark_full_load_completed()
+            ):
+                if not self.state.is_full_load_completed():
+                    self.state.mark_full_load_completed()
+                self.state.mark_sync_completed()
 
             return {
                 "google_fit_steps": steps_df,
@@ -128,13 +191,28 @@ class GoogleFitService(PluginService):
             "redirect_uri": REDIRECT_URI,
             "grant_type": "authorization_code",
         }
-        r = requests.post(TOKEN_URL, data=data)
+        r = self._session.post(TOKEN_URL, data=data)
         r.raise_for_status()
         tokens = r.json()
-        TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-        TOKEN_FILE.write_text(json.dumps(tokens, indent=2))
+        tokens["acquired_at"] = time.time()
+        self._save_tokens(tokens)
         return tokens
 
+    def _save_tokens(self, tokens: dict) -> None:
+        """Persist tokens atomically, skipping the write when unchanged.
+
+        Writing a temp file and os.replace()-ing it in keeps a crash from
+        leaving a truncated token file behind.
+        """
+        payload = json.dumps(tokens)
+        if payload == self._last_saved_tokens:
+            return
+        TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = TOKEN_FILE.with_suffix(".json.tmp")
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, TOKEN_FILE)
+        self._last_saved_tokens = payload
+
     def _refresh_access_token(self, refresh_token: str, client_id: str, client_secret: str) -> dict:
         data = {
             "client_id": client_id,
@@ -142,17 +220,24 @@ class GoogleFitService(PluginService):
             "refresh_token": refresh_token,
             "grant_type": "refresh_token",
         }
-        r = requests.post(TOKEN_URL, data=data)
+        r = self._session.post(TOKEN_URL, data=data)
         r.raise_for_status()
         tokens = r.json()
         tokens["refresh_token"] = refresh_token
-        TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-        TOKEN_FILE.write_text(json.dumps(tokens, indent=2))
+        tokens["acquired_at"] = time.time()
+        self._save_tokens(tokens)
         return tokens
 
     def _get_tokens(self, client_id: str, client_secret: str) -> dict:
         if TOKEN_FILE.exists():
             tokens = json.loads(TOKEN_FILE.read_text())
+            # Reuse the stored access token while it has more than five
+            # minutes left; refreshing on every run costs an extra token
+            # round trip for nothing.
+            acquired_at = tokens.get("acquired_at", 0)
+            expires_in = tokens.get("expires_in", 0)
+            if tokens.get("access_token") and time.time() < acquired_at + expires_in - 300:
+                return tokens
             if "refresh_token" in tokens:
                 return self._refresh_access_token(tokens["refresh_token"], client_id, client_secret)
 
@@ -179,25 +264,68 @@ class GoogleFitService(PluginService):
             current_start = current_end
         return ranges
 
-    def _fetch_data_for_source(self, access_token: str, data_source: str, bucket_millis: int, user_id: str) -> pd.DataFrame:
-        days_to_fetch = self.state.get_data_fetch_range_days()
-
-        end_dt = datetime.now(timezone.utc)
-        start_dt = end_dt - timedelta(days=days_to_fetch)
-
-        headers = {"Authorization": f"Bearer {access_token}"}
-        all_records = []
+    def _refreshed_headers(self) -> dict | None:
+        """Refresh the access token and return new auth headers.
+
+        The lock serializes concurrent 401s from the fan-out; once the
+        first caller has refreshed, _get_tokens sees a fresh acquired_at
+        and hands the others the same token without another round trip.
+        """
+        if not self._credentials:
+            return None
+        with self._reauth_lock:
+            tokens = self._get_tokens(*self._credentials)
+        if not tokens:
+            return None
+        return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    def _fetch_chunk(self, headers: dict, body_prefix: bytes, start_ms: int, end_ms: int):
+        # Only the two timestamps differ between windows, so each body is a
+        # byte splice onto the pre-serialized skeleton instead of a fresh
+        # json.dumps of the whole nested structure.
+        body = body_prefix + b',"startTimeMillis":%d,"endTimeMillis":%d}' % (start_ms, end_ms)
+        r = self._session.post(AGGREGATE_URL, headers=headers, data=body)
+        if r.status_code == 401:
+            # Token expired mid-run: refresh once and replay this request
+            # instead of burning the rest of the fan-out on dead 401s.
+            refreshed = self._refreshed_headers()
+            if refreshed is not None:
+                r = self._session.post(AGGREGATE_URL, headers={**headers, **refreshed}, data=body)
+        return r
+
+    def _fetch_data_for_source(self, access_token: str, data_source: str, bucket_millis: int, user_id: str, ranges: list) -> pd.DataFrame:
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
 
-        for start_ms, end_ms in self._chunked_time_ranges(start_dt, end_dt):
-            body = {
-                "aggregateBy": [{"dataSourceId": data_source}],
-                "bucketByTime": {"durationMillis": bucket_millis},
-                "startTimeMillis": start_ms,
-                "endTimeMillis": end_ms,
-            }
+        # Serialize the static part of the request body once per source.
+        body_template = {
+            "aggregateBy": [{"dataSourceId": data_source}],
+            "bucketByTime": {"durationMillis": bucket_millis},
+        }
+        if orjson is not None:
+            body_prefix = orjson.dumps(body_template)[:-1]
+        else:
+            body_prefix = json.dumps(body_template, separators=(",", ":")).encode()[:-1]
+
+        # Each 90-day window is an independent request; overlapping them
+        # collapses the wall time from one round trip per window to roughly
+        # one round trip overall. map() keeps the responses in window order.
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+            responses = list(
+                pool.map(
+                    lambda window: self._fetch_chunk(headers, body_prefix, *window),
+                    ranges,
+                )
+            )
 
-            url = "https://www.googleapis.com/fitness/v1/users/me/dataset:aggregate"
-            r = requests.post(url, headers=headers, json=body)
+        # Collect primitive columns while scanning the JSON instead of one
+        # dict (plus a per-row UUID and datetime conversion) per point; the
+        # heavy work then happens once, vectorized, on the whole pull.
+        start_ns = []
+        values = []
+        for r in responses:
             if r.status_code == 403:
                 logger.warning("Permission denied for %s. Skipping...", data_source)
                 break
@@ -205,58 +333,90 @@ class GoogleFitService(PluginService):
                 logger.error("Google Fit API error %s: %s", r.status_code, r.text)
                 continue
 
-            data = r.json()
+            if orjson is not None:
+                # Parses the raw bytes directly, skipping the text decode
+                # that response.json() does first.
+                data = orjson.loads(r.content)
+            else:
+                data = r.json()
 
             for bucket in data.get("bucket", []):
                 for dataset in bucket.get("dataset", []):
                     for point in dataset.get("point", []):
-                        start_ts = int(point["startTimeNanos"]) / 1_000_000_000
+                        point_start_ns = int(point["startTimeNanos"])
                         for value in point.get("value", []):
-                            record = {
-                                "id": str(uuid.uuid4()),
-                                "user_id": user_id,
-                                "timestamp": datetime.fromtimestamp(start_ts, tz=timezone.utc).replace(tzinfo=None),
-                            }
                             if "intVal" in value:
-                                record["value"] = value["intVal"]
+                                start_ns.append(point_start_ns)
+                                values.append(value["intVal"])
                             elif "fpVal" in value:
-                                record["value"] = round(value["fpVal"], 2)
-                            all_records.append(record)
-
-            time.sleep(0.1)
-
-        return pd.DataFrame(all_records)
-
-    def _fetch_steps_data(self, access_token: str, user_id: str) -> pd.DataFrame:
-        df = self._fetch_data_for_source(access_token, DATA_SOURCES["steps"], 86400000, user_id)
+                                start_ns.append(point_start_ns)
+                                values.append(round(value["fpVal"], 2))
+
+        if not start_ns:
+            return pd.DataFrame()
+
+        # One C-level nanosecond->datetime pass for every point at once.
+        timestamps = pd.to_datetime(
+            np.asarray(start_ns, dtype=np.int64), utc=True
+        ).tz_localize(None)
+        # Row ids only need to be unique; one urandom syscall for the whole
+        # batch replaces a 16-byte read plus a UUID object per row.
+        raw_ids = os.urandom(16 * len(values))
+        return pd.DataFrame(
+            {
+                "id": [raw_ids[i : i + 16].hex() for i in range(0, len(raw_ids), 16)],
+                "user_id": user_id,
+                "timestamp": timestamps,
+                "value": values,
+            },
+            copy=False,
+        )
 
-        if not df.empty:
-            df = df.rename(columns={"value": "steps"})
-            df["timestamp"] = pd.to_datetime(df["timestamp"]).dt.date
-            df = (
-                df.groupby(["user_id", "timestamp"])
-                .agg({"steps": "sum", "id": "first"})
-                .reset_index()
-            )
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
+    @staticmethod
+    def _aggregate_metric(
+        df: pd.DataFrame,
+        value_column: str,
+        freq: str,
+        agg: str,
+        decimals: int | None = None,
+        carry_columns: tuple = (),
+    ) -> pd.DataFrame:
+        """Bucket timestamps to freq and aggregate value_column per user.
+
+        Every metric shares this shape — rename, floor the timestamp, group
+        by user and bucket — so the per-metric helpers reduce to constants.
+        carry_columns are constant per frame and ride along via "first".
+        """
+        df = df.rename(columns={"value": value_column})
+        # timestamp is already datetime64; floor() keeps it that way instead
+        # of the object-dtype round trip of .dt.date + to_datetime.
+        df["timestamp"] = df["timestamp"].dt.floor(freq)
+        aggregations = {value_column: agg, "id": "first"}
+        aggregations.update({column: "first" for column in carry_columns})
+        df = (
+            df.groupby(["user_id", "timestamp"])
+            .agg(aggregations)
+            .reset_index()
+        )
+        if decimals is not None:
+            df[value_column] = df[value_column].round(decimals)
+        if value_column in METRIC_DTYPES:
+            df[value_column] = df[value_column].astype(METRIC_DTYPES[value_column])
         return df
 
-    def _fetch_heart_rate_data(self, access_token: str, user_id: str) -> pd.DataFrame:
-        df = self._fetch_data_for_source(access_token, DATA_SOURCES["heart_rate"], 3600000, user_id)
+    def _fetch_steps_data(self, access_token: str, user_id: str, ranges: list) -> pd.DataFrame:
+        df = self._fetch_data_for_source(access_token, DATA_SOURCES["steps"], 86400000, user_id, ranges)
+        if df.empty:
+            return df
+        return self._aggregate_metric(df, "steps", "D", "sum")
 
-        if not df.empty:
-            df = df.rename(columns={"value": "heart_rate"})
-            df["timestamp_hour"] = pd.to_datetime(df["timestamp"]).dt.floor("h")
-            df = (
-                df.groupby(["user_id", "timestamp_hour"])
-                .agg({"heart_rate": "mean", "id": "first"})
-                .reset_index()
-            )
-            df = df.rename(columns={"timestamp_hour": "timestamp"})
-            df["heart_rate"] = df["heart_rate"].round(2)
-        return df
+    def _fetch_heart_rate_data(self, access_token: str, user_id: str, ranges: list) -> pd.DataFrame:
+        df = self._fetch_data_for_source(access_token, DATA_SOURCES["heart_rate"], 3600000, user_id, ranges)
+        if df.empty:
+            return df
+        return self._aggregate_metric(df, "heart_rate", "h", "mean", decimals=2)
 
-    def _fetch_general_data(self, access_token: str, user_id: str) -> pd.DataFrame:
+    def _fetch_general_data(self, access_token: str, user_id: str, ranges: list) -> pd.DataFrame:
         general_data_types = {
             "weight": ("weight", "kg"),
             "height": ("height", "cm"),
@@ -266,33 +426,20 @@ class GoogleFitService(PluginService):
         all_records = []
 
         for data_type_key, (data_type_name, unit) in general_data_types.items():
-            df = self._fetch_data_for_source(access_token, DATA_SOURCES[data_type_key], 86400000, user_id)
+            df = self._fetch_data_for_source(access_token, DATA_SOURCES[data_type_key], 86400000, user_id, ranges)
 
             if df.empty:
                 continue
 
-            df = df.rename(columns={"value": "value"})
-            df["date"] = pd.to_datetime(df["timestamp"]).dt.date
-            df["data_type"] = data_type_name
-            df["unit"] = unit
-            df["source"] = data_type_key
-            df = (
-                df.groupby(["user_id", "date"])
-                .agg(
-                    {
-                        "value": "mean",
-                        "id": "first",
-                        "data_type": "first",
-                        "unit": "first",
-                        "source": "first",
-                    }
-                )
-                .reset_index()
+            df = df.assign(data_type=data_type_name, unit=unit, source=data_type_key)
+            df = self._aggregate_metric(
+                df,
+                "value",
+                "D",
+                "mean",
+                decimals=2,
+                carry_columns=("data_type", "unit", "source"),
             )
-            df["date"] = pd.to_datetime(df["date"])
-            df["value"] = df["value"].round(2)
-
-            df = df.rename(columns={"date": "timestamp"})
             df["metadata"] = None
             all_records.append(df[
                 ["id", "user_id", "data_type", "timestamp", "value", "unit", "metadata"]
@@ -300,5 +447,8 @@ class GoogleFitService(PluginService):
 
         if all_records:
             combined_df = pd.concat(all_records, ignore_index=True)
-            return combined_df
+            # data_type and unit repeat one of three values per row;
+            # categorical codes store them as small ints instead of one
+            # Python string object per cell.
+            return combined_df.astype({"data_type": "category", "unit": "category"})
         return pd.DataFrame()
@@ -2,7 +2,7 @@ import os
 from datetime import datetime
 
 import pandas as pd
-import requests
+from aggregator.infrastructure.http import SHARED_SESSION
 
 X_CLIENT_HEADER = "aggregator"
 
@@ -15,7 +15,7 @@ def fetch_tags(user_id, api_token):
         "x-api-key": api_token,
         "x-client": X_CLIENT_HEADER,
     }
-    response = requests.get(url, headers=headers)
+    response = SHARED_SESSION.get(url, headers=headers)
 
     if response.status_code == 200:
         tags = response.json().get("data", [])
@@ -49,7 +49,7 @@ def fetch_completed_items(user_id, api_token, item_type, tag_dict):
         "type": type_param,
     }
     
-    response = requests.get(url, headers=headers, params=params)
+    response = SHARED_SESSION.get(url, headers=headers, params=params)
     item_data = []
 
     if response.status_code == 200:
@@ -3,7 +3,7 @@ import io
 import os
 
 import pandas as pd
-import requests
+from aggregator.infrastructure.http import SHARED_SESSION
 
 X_CLIENT_HEADER = "aggregator"
 
@@ -16,7 +16,7 @@ def fetch_tags(user_id, api_token):
         "x-api-key": api_token,
         "x-client": X_CLIENT_HEADER,
     }
-    response = requests.get(url, headers=headers)
+    response = SHARED_SESSION.get(url, headers=headers)
 
     if response.status_code == 200:
         tags = response.json().get("data", [])
@@ -38,7 +38,7 @@ def get_completed_todos(user_id, api_token, tag_dict):
         "type": "completedTodos",
     }
 
-    response = requests.get(base_url, headers=headers, params=params)
+    response = SHARED_SESSION.get(base_url, headers=headers, params=params)
 
     if response.status_code == 200:
         tasks = response.json().get("data", [])
@@ -8,6 +8,11 @@ CREATE TABLE IF NOT EXISTS habitica_items (
     notes TEXT,
     priority DECIMAL(3, 1),
     tags TEXT,
-    completed BOOLEAN
+    completed BOOLEAN,
+    -- Covering index for the NOT EXISTS dedupe probe on insert
+    KEY idx_habitica_dedupe (item_id, item_name, item_type, date_completed)
 );
 
+-- For existing installations: add the index once when updating the schema
+-- ALTER TABLE habitica_items ADD INDEX idx_habitica_dedupe (item_id, item_name, item_type, date_completed);
+
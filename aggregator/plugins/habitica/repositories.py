@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple, Union
 
 import pandas as pd
 from sqlalchemy import text
@@ -19,8 +19,15 @@ class HabiticaRepository:
             str(Path(__file__).parent / "queries" / "habitica_items.sql")
         )
 
-    def write_items(self, df: pd.DataFrame) -> Tuple[int, int]:
-        if df is None or df.empty:
+    def write_items(
+        self, frames: Union[pd.DataFrame, List[pd.DataFrame], None]
+    ) -> Tuple[int, int]:
+        if frames is None:
+            return 0, 0
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        frames = [df for df in frames if df is not None and not df.empty]
+        if not frames:
             return 0, 0
 
         dtype_mapping = {
@@ -37,29 +44,58 @@ class HabiticaRepository:
         }
 
         temp_table_name = "temp_habitica_items"
+        key_columns = ["item_id", "item_name", "item_type", "date_completed"]
 
-        original_count = len(df)
-        df = df.drop_duplicates(
-            subset=["item_id", "item_name", "item_type", "date_completed"],
-            keep="first",
+        # Dedupe across frames on a uint64 hash of the key columns so only
+        # the 8-byte hashes are ever concatenated, never the frames.
+        original_count = sum(len(df) for df in frames)
+        key_hashes = pd.concat(
+            [pd.util.hash_pandas_object(df[key_columns], index=False) for df in frames],
+            ignore_index=True,
         )
-        duplicate_count = original_count - len(df)
+        dup_mask = key_hashes.duplicated(keep="first").values
+        if dup_mask.any():
+            kept = []
+            offset = 0
+            for df in frames:
+                frame_mask = dup_mask[offset : offset + len(df)]
+                offset += len(df)
+                kept.append(df.loc[~frame_mask] if frame_mask.any() else df)
+            frames = [df for df in kept if not df.empty]
+        duplicate_count = original_count - sum(len(df) for df in frames)
+
+        if not frames:
+            return 0, duplicate_count
 
         with connection() as conn:
-            df.to_sql(
+            frames[0].head(0).to_sql(
                 temp_table_name,
                 con=conn,
                 if_exists="replace",
                 index=False,
                 dtype=dtype_mapping,
             )
+            for df in frames:
+                df.to_sql(
+                    temp_table_name,
+                    con=conn,
+                    if_exists="append",
+                    index=False,
+                    dtype=dtype_mapping,
+                )
 
+            # NOT EXISTS lets the optimizer stop at the first match per row
+            # with an index probe on idx_habitica_dedupe, instead of
+            # materializing the whole LEFT JOIN before filtering.
             insert_query = f"""
                 INSERT INTO {self.table_name} (item_id, item_name, item_type, value, date_created, date_completed, notes, priority, tags, completed)
                 SELECT t.item_id, t.item_name, t.item_type, t.value, t.date_created, t.date_completed, t.notes, t.priority, t.tags, t.completed
                 FROM {temp_table_name} t
-                LEFT JOIN {self.table_name} h ON t.item_id = h.item_id AND t.item_name = h.item_name AND t.item_type = h.item_type AND t.date_completed = h.date_completed
-                WHERE h.item_id IS NULL
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {self.table_name} h
+                    WHERE h.item_id = t.item_id AND h.item_name = t.item_name
+                      AND h.item_type = t.item_type AND h.date_completed = t.date_completed
+                )
             """
             result = conn.execute(text(insert_query))
             inserted_count = result.rowcount
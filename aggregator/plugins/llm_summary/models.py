@@ -13,7 +13,7 @@ class Window(str, Enum):
     LAST_12_MONTHS = "LAST_12_MONTHS"
 
 
-@dataclass
+@dataclass(slots=True)
 class Metric:
     name: str
     source: str
@@ -24,7 +24,7 @@ class Metric:
     confidence: str = "medium"
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryIntent:
     primary_concepts: List[str]
     related_keywords: List[str]
@@ -33,13 +33,13 @@ class QueryIntent:
     confidence: str = "medium"
 
 
-@dataclass
+@dataclass(slots=True)
 class TrendPoint:
     period: str
     value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryTrend:
     name: str
     source: str
@@ -49,7 +49,7 @@ class CategoryTrend:
     direction: str  # emerging | declining | steady
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginSummary:
     plugin: str
     monthly: List[TrendPoint] = field(default_factory=list)
@@ -59,7 +59,7 @@ class PluginSummary:
     notes: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextPayload:
     start_date: date
     end_date: date
@@ -71,13 +71,13 @@ class ContextPayload:
     data_gaps: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
     role: str
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatRequest:
     messages: List[ChatMessage]
     model: str
@@ -85,7 +85,7 @@ class ChatRequest:
     max_tokens: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatResponse:
     content: str
     raw: Dict[str, Any]
@@ -1,5 +1,6 @@
 import logging
-from datetime import date
+from datetime import date, datetime
+from decimal import Decimal
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -12,6 +13,26 @@ logger = logging.getLogger(__name__)
 BASE_QUERIES = Path(__file__).parent / "queries"
 
 
+def _coerce(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _rows_to_dicts(result) -> List[Dict[str, Any]]:
+    """Materialize rows as JSON-native dicts (Decimal->float, dates->ISO).
+
+    Coercing once at the repository boundary keeps serialization free of
+    per-value default= callbacks downstream.
+    """
+    columns = result.keys()
+    return [
+        {k: _coerce(v) for k, v in zip(columns, row)} for row in result.fetchall()
+    ]
+
+
 class LlmSummaryRepository:
     """Read-only access to plugin tables with defensive existence checks."""
 
@@ -40,14 +61,42 @@ class LlmSummaryRepository:
         query = path.read_text()
         with connection() as conn:
             result = conn.execute(text(query), params)
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in result.fetchall()]
+            return _rows_to_dicts(result)
 
     def get_categories(self, sql_file: str, params: Dict[str, Any]) -> List[Dict]:
         if sql_file == "google_fit_categories.sql":
             return self._google_fit_categories(params)
         return self.get_monthly_summary(sql_file, params)
 
+    def get_plugin_bundle(
+        self, monthly_file: str, category_file: str, params: Dict[str, Any], top_n: int
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Fetch monthly summary and categories for one plugin in a single checkout.
+
+        Both statements run on the same connection so a plugin costs one pool
+        checkout/commit instead of two; the Google Fit files need dynamic column
+        resolution and keep their dedicated helpers.
+        """
+        category_params = {**params, "limit_rows": top_n * 2}
+        if monthly_file == "google_fit_monthly_summary.sql":
+            return (
+                self._google_fit_monthly(params),
+                self._google_fit_categories(category_params),
+            )
+
+        monthly_path = BASE_QUERIES / monthly_file
+        category_path = BASE_QUERIES / category_file
+        monthly_rows: List[Dict] = []
+        category_rows: List[Dict] = []
+        with connection() as conn:
+            if monthly_path.exists():
+                result = conn.execute(text(monthly_path.read_text()), params)
+                monthly_rows = _rows_to_dicts(result)
+            if category_path.exists():
+                result = conn.execute(text(category_path.read_text()), category_params)
+                category_rows = _rows_to_dicts(result)
+        return monthly_rows, category_rows
+
     def get_plugin_presence(self) -> Dict[str, bool]:
         return {
             "asana": self.table_exists("asana_items"),
@@ -74,8 +123,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             result = conn.execute(query, {"limit_rows": limit_rows})
-            cols = result.keys()
-            return [dict(zip(cols, row)) for row in result.fetchall()]
+            return _rows_to_dicts(result)
 
     # Google Fit helpers with dynamic date column detection
     def _date_column(self, table: str) -> Optional[str]:
@@ -139,8 +187,7 @@ class LlmSummaryRepository:
         """
         with connection() as conn:
             result = conn.execute(text(query), params)
-            cols = result.keys()
-            return [dict(zip(cols, row)) for row in result.fetchall()]
+            return _rows_to_dicts(result)
 
     def _google_fit_categories(self, params: Dict[str, Any]) -> List[Dict]:
         general_col = self._date_column("google_fit_general")
@@ -159,8 +206,7 @@ class LlmSummaryRepository:
         """
         with connection() as conn:
             result = conn.execute(text(query), params)
-            cols = result.keys()
-            return [dict(zip(cols, row)) for row in result.fetchall()]
+            return _rows_to_dicts(result)
 
     # New aggregate helpers
     def run_query(self, sql_file: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -170,8 +216,7 @@ class LlmSummaryRepository:
         query = path.read_text()
         with connection() as conn:
             result = conn.execute(text(query), params)
-            cols = result.keys()
-            return [dict(zip(cols, row)) for row in result.fetchall()]
+            return _rows_to_dicts(result)
 
     def global_monthly(self, start_date, end_date, limit_rows=12) -> List[Dict]:
         return self.run_query("global_monthly_rollup.sql", {"start_date": start_date, "end_date": end_date, "limit_rows": limit_rows})
@@ -222,7 +267,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             row = conn.execute(sql, {"start_date": start_date, "end_date": end_date}).fetchone()
-            return dict(row._mapping) if row else {}
+            return {k: _coerce(v) for k, v in row._mapping.items()} if row else {}
 
     def toggl_totals(self, start_date, end_date) -> Dict[str, Any]:
         if not self.table_exists("toggl_items"):
@@ -241,7 +286,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             row = conn.execute(sql, {"start_date": start_date, "end_date": end_date}).fetchone()
-            return dict(row._mapping) if row else {}
+            return {k: _coerce(v) for k, v in row._mapping.items()} if row else {}
 
     def habitica_totals(self, start_date, end_date) -> Dict[str, Any]:
         if not self.table_exists("habitica_items"):
@@ -255,7 +300,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             row = conn.execute(sql, {"start_date": start_date, "end_date": end_date}).fetchone()
-            return dict(row._mapping) if row else {}
+            return {k: _coerce(v) for k, v in row._mapping.items()} if row else {}
 
     def google_fit_totals(self, start_date, end_date) -> Dict[str, Any]:
         if not self.table_exists("google_fit_steps"):
@@ -271,7 +316,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             row = conn.execute(sql, {"start_date": start_date, "end_date": end_date}).fetchone()
-            return dict(row._mapping) if row else {}
+            return {k: _coerce(v) for k, v in row._mapping.items()} if row else {}
 
     def toggl_daily_series(self, start_date, end_date) -> List[Dict]:
         if not self.table_exists("toggl_items"):
@@ -287,8 +332,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             res = conn.execute(sql, {"start_date": start_date, "end_date": end_date})
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def asana_daily_series(self, start_date, end_date) -> List[Dict]:
         if not self.table_exists("asana_items"):
@@ -304,8 +348,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             res = conn.execute(sql, {"start_date": start_date, "end_date": end_date})
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def habitica_daily_series(self, start_date, end_date) -> List[Dict]:
         return self.habitica_daily(start_date, end_date)
@@ -328,8 +371,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             res = conn.execute(sql, {"start_date": start_date, "end_date": end_date, "limit_rows": limit_rows})
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def toggl_categories_window(self, start_date, end_date, limit_rows=8) -> List[Dict]:
         if not self.table_exists("toggl_items"):
@@ -346,8 +388,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             res = conn.execute(sql, {"start_date": start_date, "end_date": end_date, "limit_rows": limit_rows})
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def habitica_categories_window(self, start_date, end_date, limit_rows=8) -> List[Dict]:
         if not self.table_exists("habitica_items"):
@@ -364,8 +405,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             res = conn.execute(sql, {"start_date": start_date, "end_date": end_date, "limit_rows": limit_rows})
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def fit_categories_window(self, start_date, end_date, limit_rows=8) -> List[Dict]:
         if not self.table_exists("google_fit_general"):
@@ -383,8 +423,7 @@ class LlmSummaryRepository:
         )
         with connection() as conn:
             res = conn.execute(sql, {"start_date": start_date, "end_date": end_date, "limit_rows": limit_rows})
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     # Focused discovery (keyword-based)
     def _like_clauses(self, fields: List[str], patterns: List[str]) -> Tuple[str, Dict[str, Any]]:
@@ -415,8 +454,7 @@ class LlmSummaryRepository:
         params.update({"start_date": start_date, "end_date": end_date})
         with connection() as conn:
             res = conn.execute(sql, params)
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def toggl_focus_daily(self, patterns: List[str], start_date=None, end_date=None) -> List[Dict]:
         if not self.table_exists("toggl_items"):
@@ -434,8 +472,7 @@ class LlmSummaryRepository:
         params.update({"start_date": start_date, "end_date": end_date})
         with connection() as conn:
             res = conn.execute(sql, params)
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def habitica_focus_daily(self, patterns: List[str], start_date=None, end_date=None) -> List[Dict]:
         if not self.table_exists("habitica_items"):
@@ -453,8 +490,7 @@ class LlmSummaryRepository:
         params.update({"start_date": start_date, "end_date": end_date})
         with connection() as conn:
             res = conn.execute(sql, params)
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
 
     def fit_focus_daily(self, patterns: List[str], start_date=None, end_date=None) -> List[Dict]:
         if not self.table_exists("google_fit_general"):
@@ -473,5 +509,4 @@ class LlmSummaryRepository:
         params.update({"start_date": start_date, "end_date": end_date})
         with connection() as conn:
             res = conn.execute(sql, params)
-            cols = res.keys()
-            return [dict(zip(cols, row)) for row in res.fetchall()]
+            return _rows_to_dicts(res)
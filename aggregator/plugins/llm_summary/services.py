@@ -1,20 +1,27 @@
+import io
+import itertools
 import json
 import logging
 import math
 import statistics
 import time
 from collections import defaultdict
+from dataclasses import asdict
 from datetime import date, datetime, timedelta
-from decimal import Decimal
 from typing import Any, Dict, List, Tuple, Optional
 
-import requests
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 from aggregator.core.apps import PluginService
+from aggregator.infrastructure.http import SHARED_SESSION
+from aggregator.infrastructure.time import utcnow
 from aggregator.plugins.llm_summary.models import (
     CategoryTrend,
-    ChatMessage,
-    ChatRequest,
     ChatResponse,
     ContextPayload,
     PluginSummary,
@@ -52,10 +59,55 @@ STOPWORDS = {
 }
 
 
+# Window sizes per reporting period; deprecated datetime.utcnow() is replaced
+# by the shared timezone-aware helper
+_PERIOD_DELTAS = {
+    "last_month": timedelta(days=30),
+    "last_90_days": timedelta(days=90),
+    "last_12_months": timedelta(days=365),
+}
+
+# Rough chars-per-token ratio used to translate the model's token budget
+# into a context character cap (tiktoken-level accuracy is not needed here)
+CHARS_PER_TOKEN = 4
+
+# Table presence only changes when the schema does; cache it this long (seconds)
+PRESENCE_CACHE_TTL = 300
+
+# Bound for the per-service trend memo; cleared wholesale once full
+TREND_CACHE_MAX = 256
+
+# Monthly value column per plugin, resolved once instead of chained .get() per row
+VALUE_COLS = {
+    "asana": "completed_tasks",
+    "toggl": "entry_count",
+    "habitica": "completed_items",
+    "google_fit": "steps_total",
+}
+
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize to UTF-8 bytes without an intermediate str per fragment."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize context payloads, preferring orjson's C encoder when present.
+
+    Repository rows are coerced to JSON-native types at the boundary, so no
+    per-value default= fallback is needed here.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+
 class LlmSummaryService(PluginService):
     name = "llm_summary"
 
-    def __init__(self, project_settings=None) -> None:
+    def __init__(self, project_settings=None, session=None) -> None:
         self.settings = project_settings or settings
         self.repo = LlmSummaryRepository()
         llm = self.settings.llm_summary
@@ -66,13 +118,50 @@ class LlmSummaryService(PluginService):
         self.timeout = llm["timeout"]
         self.months = llm["months"]
         self.top_n = llm["top_n"]
-        self.max_context_chars = min(llm["max_context_chars"], 6000)
+        # Clamp the context to what actually fits in the model's window after
+        # reserving the completion budget; anything beyond it would be
+        # truncated server-side at full prefill cost anyway.
+        context_window = llm.get("context_window_tokens", 4096)
+        prompt_budget_chars = max(context_window - self.max_tokens, 256) * CHARS_PER_TOKEN
+        self.max_context_chars = min(llm["max_context_chars"], 6000, prompt_budget_chars)
         self.emerge_threshold_pct = llm["emerge_threshold_pct"]
         self.decline_threshold_pct = llm["decline_threshold_pct"]
+        # Reuse one pooled session so repeated LLM calls keep the TCP
+        # connection alive instead of re-handshaking per request.
+        self._session = session or SHARED_SESSION
+        self._presence_cache: Optional[Tuple[float, Dict[str, bool]]] = None
+        self._trend_cache: Dict[Tuple[str, Tuple], List[CategoryTrend]] = {}
+        # System prompts are constant; build them once as payload-ready dicts
+        self._system_message = {
+            "role": "system",
+            "content": (
+                "You are a reporting layer, not an analyst. Do NOT infer trends beyond the provided context.\n"
+                "Only narrate the context; do not think aloud. If information is missing, say so plainly.\n"
+                "Do not repeat metrics across sections. Tone: senior analyst, calm, supportive.\n"
+            ),
+        }
+        self._focus_system_message = {
+            "role": "system",
+            "content": (
+                "You are summarizing how the user is doing on ONE specific topic.\n"
+                "You are a narrator, not an analyst. Do not infer trends not explicitly stated.\n"
+                "If evidence is weak, say so clearly. No guilt framing."
+            ),
+        }
 
     def setup(self) -> bool:
+        self._presence_cache = None
         return True
 
+    def _plugin_presence(self) -> Dict[str, bool]:
+        """Return cached table presence; one INFORMATION_SCHEMA pass per TTL."""
+        now = time.time()
+        if self._presence_cache and now - self._presence_cache[0] < PRESENCE_CACHE_TTL:
+            return self._presence_cache[1]
+        presence = self.repo.get_plugin_presence()
+        self._presence_cache = (now, presence)
+        return presence
+
     def fetch_data(self):
         return None
 
@@ -84,6 +173,20 @@ class LlmSummaryService(PluginService):
     ) -> Tuple[str, ContextPayload]:
         window_months = months or self.months
         top_n = top_n or self.top_n
+
+        # Misconfigured environments have no plugin tables at all; skip the
+        # windowed totals, snapshots and serialization outright.
+        presence = self._plugin_presence()
+        if not any(presence.values()):
+            data_gaps = ["No plugin tables present; nothing to summarize."]
+            payload = ContextPayload(
+                start_date=start_date,
+                end_date=end_date,
+                window_months=window_months,
+                data_gaps=data_gaps,
+            )
+            return _dumps({"summaries": [], "data_gaps": data_gaps}), payload
+
         windows = self._window_ranges(end_date)
         metrics: List[Metric] = []
         caveats: List[str] = []
@@ -161,13 +264,21 @@ class LlmSummaryService(PluginService):
         for source in ["asana", "toggl", "habitica", "google_fit"]:
             summaries.append(PluginSummary(plugin=source))
 
+        # One chained pass over all summaries, partitioned once at the end
+        # rather than two filtered lists per plugin
+        all_trends = list(
+            itertools.chain.from_iterable(self._detect_trends(s) for s in summaries)
+        )
+        emerging = [t for t in all_trends if t.direction == "emerging"][:top_n]
+        declining = [t for t in all_trends if t.direction == "declining"][:top_n]
+
         payload = ContextPayload(
             start_date=start_date,
             end_date=end_date,
             window_months=window_months,
             summaries=summaries,
-            emerging=[],
-            declining=[],
+            emerging=emerging,
+            declining=declining,
             anomalies=[],
             data_gaps=caveats,
         )
@@ -178,6 +289,8 @@ class LlmSummaryService(PluginService):
     def generate_progress_summary(self, period: str = "last_month") -> str:
         start_date, end_date = self._date_range(period)
         context_text, payload = self.build_context(start_date, end_date)
+        if not payload.summaries:
+            return self._fallback_summary(payload)
         prompt = (
             "Produce a concise, data-grounded progress summary.\n"
             "Use this exact section order:\n"
@@ -201,6 +314,8 @@ class LlmSummaryService(PluginService):
     def chat(self, question: str, period: str = "last_12_months") -> str:
         start_date, end_date = self._date_range(period)
         context_text, payload = self.build_context(start_date, end_date)
+        if not payload.summaries:
+            return self._fallback_summary(payload)
         prompt = question
         try:
             return self._ask_llm(context_text, prompt)
@@ -255,19 +370,10 @@ class LlmSummaryService(PluginService):
         params: Dict[str, Any],
         top_n: int,
     ) -> PluginSummary:
-        monthly = self.repo.get_monthly_summary(monthly_file, params)
-        categories = self.repo.get_categories(category_file, {**params, "limit_rows": top_n * 2})
+        monthly, categories = self.repo.get_plugin_bundle(monthly_file, category_file, params, top_n)
+        value_col = VALUE_COLS.get(plugin, "entry_count")
         monthly_points = [
-            TrendPoint(
-                period=row["period"],
-                value=float(
-                    row.get("entry_count")
-                    or row.get("completed_tasks")
-                    or row.get("steps_total")
-                    or row.get("completed_items")
-                    or 0
-                ),
-            )
+            TrendPoint(period=row["period"], value=float(row.get(value_col) or 0))
             for row in monthly
         ]
 
@@ -292,28 +398,52 @@ class LlmSummaryService(PluginService):
         if len(monthly) < 2:
             return trends
 
-        last = monthly[0].value
-        prior = monthly[1].value
-        if prior == 0 and last == 0:
+        # Memoize per (plugin, series): repeated context builds over unchanged
+        # monthly data skip the recomputation entirely.
+        cache_key = (summary.plugin, tuple((m.period, m.value) for m in monthly))
+        cached = self._trend_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        # One vectorized pass over all consecutive month pairs (monthly is
+        # newest-first, so values[:-1] is "last" and values[1:] is "prior").
+        values = np.fromiter((m.value for m in monthly), dtype=np.float64, count=len(monthly))
+        if values[0] == 0 and values[1] == 0:
             return trends
-        change_pct = ((last - prior) / prior * 100) if prior else 100.0
-        direction = "steady"
-        if change_pct >= self.emerge_threshold_pct:
-            direction = "emerging"
-        elif change_pct <= -self.decline_threshold_pct:
-            direction = "declining"
+        last, prior = values[:-1], values[1:]
+        pct = np.where(prior != 0, np.divide(last - prior, np.where(prior != 0, prior, 1)) * 100, 100.0)
+        directions = np.full(pct.shape, "steady", dtype=object)
+        directions[pct >= self.emerge_threshold_pct] = "emerging"
+        directions[pct <= -self.decline_threshold_pct] = "declining"
 
         trends.append(
             CategoryTrend(
                 name=f"{summary.plugin}_overall",
                 source=summary.plugin,
-                last_value=last,
-                prior_value=prior,
-                change_pct=round(change_pct, 1),
-                direction=direction,
+                last_value=float(values[0]),
+                prior_value=float(values[1]),
+                change_pct=round(float(pct[0]), 1),
+                direction=str(directions[0]),
             )
         )
-        return trends
+        # Older month pairs only surface when they carry a real signal
+        for i in range(1, len(pct)):
+            if directions[i] == "steady" or (last[i] == 0 and prior[i] == 0):
+                continue
+            trends.append(
+                CategoryTrend(
+                    name=f"{summary.plugin}_{monthly[i].period}",
+                    source=summary.plugin,
+                    last_value=float(last[i]),
+                    prior_value=float(prior[i]),
+                    change_pct=round(float(pct[i]), 1),
+                    direction=str(directions[i]),
+                )
+            )
+        if len(self._trend_cache) >= TREND_CACHE_MAX:
+            self._trend_cache.clear()
+        self._trend_cache[cache_key] = trends
+        return list(trends)
 
     def _normalize_tokens(self, text_val: str) -> List[str]:
         tokens = []
@@ -483,30 +613,12 @@ class LlmSummaryService(PluginService):
         coverage: List[Dict[str, Any]],
         best: Dict[str, Any],
     ) -> str:
-        def clamp(text: str) -> str:
-            if len(text) <= self.max_context_chars:
-                return text
-            return text[: self.max_context_chars] + "... (truncated)"
-
-        summaries_block = []
-        for summary in payload.summaries:
-            cat_display = summary.categories[:top_n]
-            summaries_block.append(
-                {
-                    "plugin": summary.plugin,
-                    "monthly": [{tp.period: tp.value} for tp in summary.monthly[: payload.window_months]],
-                    "categories": cat_display,
-                    "recent_30d": summary.recent_30d,
-                    "recent_90d": summary.recent_90d,
-                }
-            )
-
-        context = {
-            "date_range": {"start": str(payload.start_date), "end": str(payload.end_date)},
-            "summaries": summaries_block,
+        # Serialize incrementally so cost stays O(max_context_chars): once the
+        # buffer exceeds the cap, remaining sections are never even built.
+        tail_sections = {
             "themes": themes,
-            "emerging": [trend.__dict__ for trend in payload.emerging],
-            "declining": [trend.__dict__ for trend in payload.declining],
+            "emerging": [asdict(trend) for trend in payload.emerging],
+            "declining": [asdict(trend) for trend in payload.declining],
             "correlations": correlations,
             "streaks": streaks,
             "coverage": coverage,
@@ -516,99 +628,127 @@ class LlmSummaryService(PluginService):
             "source_notes": "All numbers are read-only rollups from plugin tables; source keys match plugin names. Only top relevant themes are surfaced; noise omitted.",
         }
 
-        def _encode(obj):
-            if isinstance(obj, Decimal):
-                return float(obj)
-            return str(obj)
-
-        context_text = json.dumps(context, ensure_ascii=False, default=_encode)
-        return clamp(context_text)
+        # Fragments stay as the encoder's raw bytes until the very end; one
+        # decode on the assembled buffer instead of one per fragment.
+        buf = io.BytesIO()
+        buf.write(b'{"date_range": ')
+        buf.write(_dumps_bytes({"start": str(payload.start_date), "end": str(payload.end_date)}))
+        buf.write(b', "summaries": [')
+        truncated = False
+        for i, summary in enumerate(payload.summaries):
+            if buf.tell() > self.max_context_chars:
+                truncated = True
+                break
+            monthly = summary.monthly[: payload.window_months]
+            block = {
+                "plugin": summary.plugin,
+                # Parallel arrays instead of one single-key dict per month
+                "monthly": {
+                    "periods": [tp.period for tp in monthly],
+                    "values": [tp.value for tp in monthly],
+                },
+                # recent_30d/recent_90d stay on PluginSummary for programmatic
+                # consumers but are not re-serialized here: they are the first
+                # two monthly rows and would encode the same data twice.
+                "categories": summary.categories[:top_n],
+            }
+            if i:
+                buf.write(b", ")
+            buf.write(_dumps_bytes(block))
+        buf.write(b"]")
+        for key, value in tail_sections.items():
+            if buf.tell() > self.max_context_chars:
+                truncated = True
+                break
+            buf.write(f', "{key}": '.encode())
+            buf.write(_dumps_bytes(value))
+        buf.write(b"}")
+
+        context_text = buf.getvalue().decode()
+        if truncated or len(context_text) > self.max_context_chars:
+            return context_text[: self.max_context_chars] + "... (truncated)"
+        return context_text
 
     def _ask_llm(self, context_text: str, prompt: str) -> str:
-        messages = [
-            ChatMessage(
-                role="system",
-                content=(
-                    "You are a reporting layer, not an analyst. Do NOT infer trends beyond the provided context.\n"
-                    "Only narrate the context; do not think aloud. If information is missing, say so plainly.\n"
-                    "Do not repeat metrics across sections. Tone: senior analyst, calm, supportive.\n"
-                ),
+        user_message = {
+            "role": "user",
+            "content": (
+                f"Context:\n{context_text}\n\n"
+                "Output format (fixed):\n"
+                "Output structure (each ≤5 sentences):\n"
+                "1) Executive Summary (3–5 bullets, insight-driven)\n"
+                "2) Activity by Source (short paragraph per source)\n"
+                "3) Momentum & Phase Interpretation\n"
+                "4) What’s Going Well\n"
+                "5) What Changed Recently\n"
+                "6) Strategic Options (2–3, as choices, not prescriptions)\n"
+                "7) Data Confidence & Gaps\n"
+                "Never analyze raw metrics; only narrate explicit signals. Every number must include unit and window.\n"
+                f"Question: {prompt}"
             ),
-            ChatMessage(
-                role="user",
-                content=(
-                    f"Context:\n{context_text}\n\n"
-                    "Output format (fixed):\n"
-                    "Output structure (each ≤5 sentences):\n"
-                    "1) Executive Summary (3–5 bullets, insight-driven)\n"
-                    "2) Activity by Source (short paragraph per source)\n"
-                    "3) Momentum & Phase Interpretation\n"
-                    "4) What’s Going Well\n"
-                    "5) What Changed Recently\n"
-                    "6) Strategic Options (2–3, as choices, not prescriptions)\n"
-                    "7) Data Confidence & Gaps\n"
-                    "Never analyze raw metrics; only narrate explicit signals. Every number must include unit and window.\n"
-                    f"Question: {prompt}"
-                ),
-            ),
-        ]
-        req = ChatRequest(
-            messages=messages,
-            model=self.model,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-        )
+        }
         payload = {
-            "model": req.model,
-            "messages": [m.__dict__ for m in req.messages],
-            "temperature": req.temperature,
-            "max_tokens": req.max_tokens,
-            "stream": False,
+            "model": self.model,
+            "messages": [self._system_message, user_message],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True,
         }
         start = time.time()
-        resp = requests.post(self.base_url, json=payload, timeout=self.timeout)
+        content = "".join(self._ask_llm_stream(payload))
         elapsed = time.time() - start
-        resp.raise_for_status()
-        data = resp.json()
-        content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
         logger.info("LLM call complete (%.2fs)", elapsed)
-        return ChatResponse(content=content, raw=data).content
+        return ChatResponse(content=content, raw={"stream": True}).content
+
+    def _ask_llm_stream(self, payload: Dict[str, Any]):
+        """Yield content deltas from a streaming chat-completions response.
+
+        Streaming overlaps generation with consumption, so the first tokens
+        arrive after one inter-token latency instead of the full completion.
+        """
+        with self._session.post(
+            self.base_url, json=payload, stream=True, timeout=self.timeout
+        ) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                chunk = line[len("data:"):].strip()
+                if chunk == "[DONE]":
+                    break
+                try:
+                    data = json.loads(chunk)
+                except json.JSONDecodeError:
+                    continue
+                piece = data.get("choices", [{}])[0].get("delta", {}).get("content")
+                if piece:
+                    yield piece
 
     def _ask_llm_focus(self, context_text: str) -> str:
-        messages = [
-            ChatMessage(
-                role="system",
-                content=(
-                    "You are summarizing how the user is doing on ONE specific topic.\n"
-                    "You are a narrator, not an analyst. Do not infer trends not explicitly stated.\n"
-                    "If evidence is weak, say so clearly. No guilt framing."
-                ),
-            ),
-            ChatMessage(
-                role="user",
-                content=(
-                    f"Context:\n{context_text}\n\n"
-                    "Format (each ≤5 sentences):\n"
-                    "1) Overall Assessment\n"
-                    "2) Evidence Across Platforms (only matched sources)\n"
-                    "3) Momentum & Consistency\n"
-                    "4) Strengths\n"
-                    "5) Gaps or Risks (only if relevant)\n"
-                    "6) Next-Step Options (2–3, as choices)\n"
-                    "7) Confidence & Data Limits\n"
-                    "Do not analyze raw metrics; only narrate explicit signals."
-                ),
+        user_message = {
+            "role": "user",
+            "content": (
+                f"Context:\n{context_text}\n\n"
+                "Format (each ≤5 sentences):\n"
+                "1) Overall Assessment\n"
+                "2) Evidence Across Platforms (only matched sources)\n"
+                "3) Momentum & Consistency\n"
+                "4) Strengths\n"
+                "5) Gaps or Risks (only if relevant)\n"
+                "6) Next-Step Options (2–3, as choices)\n"
+                "7) Confidence & Data Limits\n"
+                "Do not analyze raw metrics; only narrate explicit signals."
             ),
-        ]
+        }
         payload = {
             "model": self.model,
-            "messages": [m.__dict__ for m in messages],
+            "messages": [self._focus_system_message, user_message],
             "temperature": self.temperature,
             "max_tokens": min(self.max_tokens, 512),
             "stream": False,
         }
         start = time.time()
-        resp = requests.post(self.base_url, json=payload, timeout=self.timeout)
+        resp = self._session.post(self.base_url, json=payload, timeout=self.timeout)
         elapsed = time.time() - start
         resp.raise_for_status()
         data = resp.json()
@@ -633,13 +773,8 @@ class LlmSummaryService(PluginService):
         return "\n".join(lines)
 
     def _date_range(self, period: str) -> Tuple[date, date]:
-        end = datetime.utcnow().date()
-        if period == "last_month":
-            start = end - timedelta(days=30)
-        elif period == "last_90_days":
-            start = end - timedelta(days=90)
-        else:
-            start = end - timedelta(days=365)
+        end = utcnow().date()
+        start = end - _PERIOD_DELTAS.get(period, _PERIOD_DELTAS["last_12_months"])
         return start, end
 
     def _daily_series(self, source: str, window: Tuple[date, date]) -> List[Dict[str, Any]]:
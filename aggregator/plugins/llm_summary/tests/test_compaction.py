@@ -33,5 +33,7 @@ def test_compact_context_truncates():
             )
         ],
     )
-    context = svc._compact_context(payload, top_n=2)
-    assert len(context) <= svc.max_context_chars + 10  # allow suffix
+    context = svc._compact_context(
+        payload, top_n=2, themes=[], correlations=[], streaks={}, coverage=[], best={}
+    )
+    assert len(context) <= svc.max_context_chars + len("... (truncated)")
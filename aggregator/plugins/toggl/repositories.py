@@ -10,6 +10,27 @@ from aggregator.infrastructure.database import connection, execute_sql_file
 
 logger = logging.getLogger(__name__)
 
+# Static target schema; hoisted so the merge SQL is identical call-to-call.
+DTYPE_MAPPING = {
+    "id": BIGINT,
+    "user_id": BIGINT,
+    "user_name": VARCHAR(255),
+    "project_id": BIGINT,
+    "project_name": VARCHAR(255),
+    "client_id": BIGINT,
+    "client_name": VARCHAR(255),
+    "description": TEXT,
+    "start_time": DATETIME,
+    "end_time": DATETIME,
+    "duration_minutes": DECIMAL(10, 2),
+    "tags": TEXT,
+    "billable": BOOLEAN,
+    "created_at": DATETIME,
+}
+
+_COLUMNS = ", ".join(DTYPE_MAPPING)
+_SET_CLAUSE = ", ".join(f"{col}=VALUES({col})" for col in DTYPE_MAPPING if col != "id")
+
 
 class TogglRepository:
     table_name = "toggl_items"
@@ -23,23 +44,6 @@ class TogglRepository:
         if df is None or df.empty:
             return 0, 0
 
-        dtype_mapping = {
-            "id": BIGINT,
-            "user_id": BIGINT,
-            "user_name": VARCHAR(255),
-            "project_id": BIGINT,
-            "project_name": VARCHAR(255),
-            "client_id": BIGINT,
-            "client_name": VARCHAR(255),
-            "description": TEXT,
-            "start_time": DATETIME,
-            "end_time": DATETIME,
-            "duration_minutes": DECIMAL(10, 2),
-            "tags": TEXT,
-            "billable": BOOLEAN,
-            "created_at": DATETIME,
-        }
-
         temp_table_name = "temp_toggl_items"
 
         original_count = len(df)
@@ -47,22 +51,23 @@ class TogglRepository:
         duplicate_count = original_count - len(df)
 
         with connection() as conn:
+            # method="multi" emits multi-row INSERT ... VALUES (...), (...)
+            # statements, turning one round trip per row into one per chunk.
             df.to_sql(
                 temp_table_name,
                 con=conn,
                 if_exists="replace",
                 index=False,
-                dtype=dtype_mapping,
+                dtype=DTYPE_MAPPING,
+                method="multi",
+                chunksize=1000,
             )
 
-            columns = ", ".join(df.columns)
-            set_clauses = ", ".join([f"{col}=VALUES({col})" for col in df.columns if col != "id"])
-
             insert_query = f"""
-                INSERT INTO {self.table_name} ({columns})
-                SELECT {columns}
+                INSERT INTO {self.table_name} ({_COLUMNS})
+                SELECT {_COLUMNS}
                 FROM {temp_table_name}
-                ON DUPLICATE KEY UPDATE {set_clauses}
+                ON DUPLICATE KEY UPDATE {_SET_CLAUSE}
             """
 
             result = conn.execute(text(insert_query))
@@ -1,5 +1,6 @@
 import importlib
 import os
+from functools import lru_cache
 
 try:
     from dotenv import load_dotenv
@@ -9,6 +10,7 @@ except ImportError:
     pass
 
 
+@lru_cache(maxsize=1)
 def load_settings():
     """Load the configured settings module (mirrors Django's approach)."""
     module_path = os.environ.get(
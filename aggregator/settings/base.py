@@ -1,6 +1,7 @@
 import os
 from dataclasses import dataclass
-from typing import List
+from functools import cached_property
+from typing import Dict, List
 
 
 @dataclass
@@ -11,6 +12,26 @@ class DatabaseSettings:
     password: str
 
 
+# Immutable app declaration shared by every Settings instance; the import
+# paths are resolved (and cached) by the app registry.
+INSTALLED_APPS = (
+    "aggregator.plugins.asana.apps.AsanaConfig",
+    "aggregator.plugins.habitica.apps.HabiticaConfig",
+    "aggregator.plugins.toggl.apps.TogglConfig",
+    "aggregator.plugins.google_fit.apps.GoogleFitConfig",
+    "aggregator.plugins.llm_summary.apps.LlmSummaryConfig",
+)
+
+# (plugin name, credential keys that must be set) — the env var for a key is
+# "<NAME>_<KEY>" uppercased, which validate() relies on for its messages.
+_VALIDATION_SPEC = (
+    ("asana", ("personal_access_token", "workspace_gid")),
+    ("habitica", ("user_id", "api_token")),
+    ("toggl", ("api_token", "workspace_id")),
+    ("google_fit", ("client_id", "client_secret")),
+)
+
+
 class Settings:
     """Django-inspired settings container with explicit configuration."""
 
@@ -34,25 +55,48 @@ class Settings:
             if plugin.strip()
         ]
 
-        # Plugin-specific credentials (kept close to settings to avoid hidden globals)
-        self.asana = {
+        # Frozen once; enablement checks are O(1) lookups, and the empty set
+        # keeps the "enable everything" default.
+        self._enabled_set = frozenset(self.enabled_plugins)
+
+        # Apps must be declared explicitly; no dynamic discovery.
+        self.INSTALLED_APPS = INSTALLED_APPS
+
+    # Plugin-specific credentials (kept close to settings to avoid hidden
+    # globals). Computed lazily so short-lived manage.py invocations only pay
+    # for the env vars the touched plugins actually read.
+    @cached_property
+    def asana(self) -> Dict:
+        return {
             "personal_access_token": os.environ.get("ASANA_PERSONAL_ACCESS_TOKEN"),
             "workspace_gid": os.environ.get("ASANA_WORKSPACE_GID"),
         }
-        self.habitica = {
+
+    @cached_property
+    def habitica(self) -> Dict:
+        return {
             "user_id": os.environ.get("HABITICA_USER_ID"),
             "api_token": os.environ.get("HABITICA_API_TOKEN"),
         }
-        self.toggl = {
+
+    @cached_property
+    def toggl(self) -> Dict:
+        return {
             "api_token": os.environ.get("TOGGL_API_TOKEN"),
             "workspace_id": os.environ.get("TOGGL_WORKSPACE_ID"),
         }
-        self.google_fit = {
+
+    @cached_property
+    def google_fit(self) -> Dict:
+        return {
             "client_id": os.environ.get("GOOGLE_FIT_CLIENT_ID"),
             "client_secret": os.environ.get("GOOGLE_FIT_CLIENT_SECRET"),
             "refresh_token": os.environ.get("GOOGLE_FIT_REFRESH_TOKEN"),
         }
-        self.llm_summary = {
+
+    @cached_property
+    def llm_summary(self) -> Dict:
+        return {
             "base_url": os.environ.get(
                 "LLM_SUMMARY_BASE_URL",
                 "http://192.168.1.46:1234/v1/chat/completions",
@@ -66,6 +110,9 @@ class Settings:
             "max_context_chars": int(
                 os.environ.get("LLM_SUMMARY_MAX_CONTEXT_CHARS", "12000")
             ),
+            "context_window_tokens": int(
+                os.environ.get("LLM_SUMMARY_CONTEXT_WINDOW_TOKENS", "4096")
+            ),
             "emerge_threshold_pct": int(
                 os.environ.get("LLM_SUMMARY_EMERGE_THRESHOLD_PCT", "60")
             ),
@@ -74,18 +121,9 @@ class Settings:
             ),
         }
 
-        # Apps must be declared explicitly; no dynamic discovery.
-        self.INSTALLED_APPS = [
-            "aggregator.plugins.asana.apps.AsanaConfig",
-            "aggregator.plugins.habitica.apps.HabiticaConfig",
-            "aggregator.plugins.toggl.apps.TogglConfig",
-            "aggregator.plugins.google_fit.apps.GoogleFitConfig",
-            "aggregator.plugins.llm_summary.apps.LlmSummaryConfig",
-        ]
-
     def is_app_enabled(self, app_label: str) -> bool:
         """Return whether the app is enabled by configuration."""
-        return not self.enabled_plugins or app_label in self.enabled_plugins
+        return not self._enabled_set or app_label in self._enabled_set
 
     def validate(self) -> dict:
         """Validate configuration and return any errors."""
@@ -103,34 +141,14 @@ class Settings:
                 "Missing MySQL configuration (MYSQL_HOST, MYSQL_DB, MYSQL_USER, MYSQL_PASSWORD)"
             )
 
-        if "asana" in self.enabled_plugins or not self.enabled_plugins:
-            if not all(self.asana.values()):
-                errors["asana"] = (
-                    "Missing Asana configuration (ASANA_PERSONAL_ACCESS_TOKEN, ASANA_WORKSPACE_GID)"
-                )
-
-        if "habitica" in self.enabled_plugins or not self.enabled_plugins:
-            if not all(self.habitica.values()):
-                errors["habitica"] = (
-                    "Missing Habitica configuration (HABITICA_USER_ID, HABITICA_API_TOKEN)"
-                )
-
-        if "toggl" in self.enabled_plugins or not self.enabled_plugins:
-            if not all(self.toggl.values()):
-                errors["toggl"] = (
-                    "Missing Toggl configuration (TOGGL_API_TOKEN, TOGGL_WORKSPACE_ID)"
-                )
-
-        if "google_fit" in self.enabled_plugins or not self.enabled_plugins:
-            if not all(
-                [
-                    self.google_fit["client_id"],
-                    self.google_fit["client_secret"],
-                ]
-            ):
-                errors["google_fit"] = (
-                    "Missing Samsung Health/Google Fit configuration (GOOGLE_FIT_CLIENT_ID, GOOGLE_FIT_CLIENT_SECRET, GOOGLE_FIT_REFRESH_TOKEN)"
-                )
+        for name, required_keys in _VALIDATION_SPEC:
+            if self._enabled_set and name not in self._enabled_set:
+                continue
+            config = getattr(self, name)
+            missing = [key for key in required_keys if not config.get(key)]
+            if missing:
+                env_vars = ", ".join(f"{name}_{key}".upper() for key in missing)
+                errors[name] = f"Missing {name} configuration ({env_vars})"
 
         return errors
 
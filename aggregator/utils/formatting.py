@@ -1,8 +1,8 @@
+# Single translation table: one pass over the string instead of one per
+# chained replace().
+_SLUG_TABLE = str.maketrans({" ": "-", "/": "-", "_": "-"})
+
+
 def slugify(value: str) -> str:
     """Simple slugify helper (keeps dependencies light)."""
-    return (
-        value.lower()
-        .replace(" ", "-")
-        .replace("/", "-")
-        .replace("_", "-")
-    )
+    return value.lower().translate(_SLUG_TABLE)